@@ -10,7 +10,7 @@
 
 namespace mav2grpc {
 
-bool StreamSubscription::matches(const mavlink::MavlinkMessage& msg) const {
+bool filter_matches(const mavlink::StreamFilter& filter, const mavlink::MavlinkMessage& msg) {
   // Check system ID filter (0 = all systems)
   if (filter.system_id() != 0 && msg.system_id() != filter.system_id()) {
     return false;
@@ -38,6 +38,10 @@ bool StreamSubscription::matches(const mavlink::MavlinkMessage& msg) const {
   return true;
 }
 
+bool StreamSubscription::matches(const mavlink::MavlinkMessage& msg) const {
+  return filter_matches(filter, msg);
+}
+
 uint64_t Router::subscribe(
     const mavlink::StreamFilter& filter,
     StreamSubscription::WriteCallback write_func) {
@@ -86,6 +90,15 @@ bool Router::unsubscribe(uint64_t subscription_id) {
 }
 
 size_t Router::route_message(const mavlink::MavlinkMessage& msg) {
+  {
+    // Cache as latest message for this (system, component, message ID)
+    uint64_t key = (static_cast<uint64_t>(msg.system_id()) << 40) |
+                   (static_cast<uint64_t>(msg.component_id()) << 32) |
+                   msg.message_id();
+    std::lock_guard<std::mutex> latest_lock(latest_mutex_);
+    latest_messages_[key] = msg;
+  }
+
   std::lock_guard<std::mutex> lock(subscriptions_mutex_);
 
   size_t delivered = 0;
@@ -117,6 +130,28 @@ size_t Router::route_message(const mavlink::MavlinkMessage& msg) {
   return delivered;
 }
 
+std::optional<mavlink::MavlinkMessage> Router::latest_message(
+    const mavlink::StreamFilter& filter) const {
+  std::lock_guard<std::mutex> lock(latest_mutex_);
+
+  const mavlink::MavlinkMessage* latest = nullptr;
+
+  for (const auto& entry : latest_messages_) {
+    const auto& msg = entry.second;
+    if (!filter_matches(filter, msg)) {
+      continue;
+    }
+    if (!latest || msg.timestamp_usec() > latest->timestamp_usec()) {
+      latest = &msg;
+    }
+  }
+
+  if (!latest) {
+    return std::nullopt;
+  }
+  return *latest;
+}
+
 size_t Router::subscription_count() const {
   std::lock_guard<std::mutex> lock(subscriptions_mutex_);
   return std::count_if(
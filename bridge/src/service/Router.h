@@ -16,9 +16,20 @@
 #include <mutex>
 #include <memory>
 #include <functional>
+#include <optional>
+#include <unordered_map>
 
 namespace mav2grpc {
 
+/**
+ * @brief Check if message matches filter criteria.
+ *
+ * @param filter Filter criteria (0 / empty fields match everything)
+ * @param msg Message to check
+ * @return true if message passes filter, false otherwise
+ */
+bool filter_matches(const mavlink::StreamFilter& filter, const mavlink::MavlinkMessage& msg);
+
 /**
  * @brief Subscription to a message stream with filtering.
  *
@@ -53,6 +64,7 @@ struct StreamSubscription {
  * - Automatic cleanup of dead/cancelled streams
  * - Thread-safe subscription management
  * - Efficient message routing
+ * - Caches the latest message per (system, component, message ID)
  *
  * Usage:
  * @code
@@ -109,6 +121,18 @@ public:
    */
   size_t route_message(const mavlink::MavlinkMessage& msg);
 
+  /**
+   * @brief Get the most recent routed message matching filter criteria.
+   *
+   * If several cached messages match (e.g. system ID 0 with multiple
+   * vehicles), the one with the newest timestamp is returned.
+   *
+   * @param filter Filter criteria
+   * @return Latest matching message, or std::nullopt if none received yet
+   */
+  std::optional<mavlink::MavlinkMessage> latest_message(
+    const mavlink::StreamFilter& filter) const;
+
   /**
    * @brief Get number of active subscriptions.
    */
@@ -125,6 +149,9 @@ private:
   mutable std::mutex subscriptions_mutex_;           ///< Protects subscriptions
   std::vector<StreamSubscription> subscriptions_;    ///< Active subscriptions
   uint64_t next_subscription_id_{1};                 ///< Next ID to assign
+
+  mutable std::mutex latest_mutex_;                  ///< Protects latest_messages_
+  std::unordered_map<uint64_t, mavlink::MavlinkMessage> latest_messages_;  ///< Last message per (sys, comp, msgid)
 };
 
 } // namespace mav2grpc
\ No newline at end of file
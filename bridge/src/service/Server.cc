@@ -36,6 +36,14 @@ void Server::start() {
   // Listen on the specified address without authentication
   builder.AddListeningPort(server_address_, grpc::InsecureServerCredentials());
   
+  // Allow clients to send keepalive pings as often as every 5s, also on idle
+  // connections (default minimum is 5min, clients pinging more often would
+  // be disconnected with GOAWAY). Clients ping every 10s; the margin keeps
+  // timer jitter from counting as ping strikes
+  builder.AddChannelArgument(GRPC_ARG_HTTP2_MIN_RECV_PING_INTERVAL_WITHOUT_DATA_MS, 5000);
+  builder.AddChannelArgument(GRPC_ARG_KEEPALIVE_PERMIT_WITHOUT_CALLS, 1);
+  builder.AddChannelArgument(GRPC_ARG_ALLOW_REUSEPORT, 1);
+
   // Register the service
   builder.RegisterService(service_.get());
   
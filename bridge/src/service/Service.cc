@@ -7,6 +7,8 @@
 #include "Logger.h"
 #include <sstream>
 #include <chrono>
+#include <memory>
+#include <mutex>
 
 namespace mav2grpc {
 
@@ -30,15 +32,35 @@ grpc::Status MavlinkBridgeServiceImpl::StreamMessages(
     Logger::Info(oss.str());
   }
 
+  // Router callbacks and the initial metadata below both write to the
+  // stream, so they are serialized; the first Write also sends the metadata
+  struct StreamState {
+    std::mutex mtx;
+    bool started = false;
+  };
+  auto state = std::make_shared<StreamState>();
+
   // Subscribe to router with filter
   uint64_t sub_id = router_.subscribe(
     *request,
-    [writer](const mavlink::MavlinkMessage& msg) -> bool {
+    [writer, state](const mavlink::MavlinkMessage& msg) -> bool {
       // Write to gRPC stream
+      std::lock_guard<std::mutex> lock(state->mtx);
+      state->started = true;
       return writer->Write(msg);
     }
   );
 
+  // Signal the client that the subscription is live, so it can send
+  // commands without missing their replies
+  {
+    std::lock_guard<std::mutex> lock(state->mtx);
+    if (!state->started) {
+      state->started = true;
+      writer->SendInitialMetadata();
+    }
+  }
+
   // Wait for client cancellation or server shutdown
   // Use wait_for with timeout to handle both:
   // - Server shutdown: notify_all() wakes immediately
@@ -100,6 +122,68 @@ grpc::Status MavlinkBridgeServiceImpl::SendMessage(
   }
 }
 
+grpc::Status MavlinkBridgeServiceImpl::SendMessageBatch(
+    grpc::ServerContext* /* context */,
+    const mavlink::MavlinkMessageBatch* request,
+    mavlink::BatchResponse* response) {
+
+  // Validate all messages before sending any of them
+  for (int i = 0; i < request->messages_size(); ++i) {
+    if (request->messages(i).payload_case() == mavlink::MavlinkMessage::PAYLOAD_NOT_SET) {
+      std::ostringstream oss;
+      oss << "No payload in message " << i;
+      response->set_success(false);
+      response->set_error(oss.str());
+      Logger::Warn("SendMessageBatch RPC failed: " + oss.str());
+      return grpc::Status(
+        grpc::StatusCode::INVALID_ARGUMENT,
+        oss.str()
+      );
+    }
+  }
+
+  // Send in order, stop at first failure
+  for (const auto& msg : request->messages()) {
+    if (!send_callback_(msg)) {
+      response->set_success(false);
+      response->set_error("Failed to send via MAVLink connection");
+      std::ostringstream oss;
+      oss << "Failed to send batch message (ID: " << msg.message_id()
+          << ", sent: " << response->sent_count()
+          << "/" << request->messages_size() << ")";
+      Logger::Error(oss.str());
+      return grpc::Status(
+        grpc::StatusCode::INTERNAL,
+        "MAVLink send failed"
+      );
+    }
+    response->set_sent_count(response->sent_count() + 1);
+  }
+
+  response->set_success(true);
+  std::ostringstream oss;
+  oss << "Sent batch of " << response->sent_count() << " messages";
+  Logger::Info(oss.str());
+  return grpc::Status::OK;
+}
+
+grpc::Status MavlinkBridgeServiceImpl::GetLatestMessage(
+    grpc::ServerContext* /* context */,
+    const mavlink::StreamFilter* request,
+    mavlink::MavlinkMessage* response) {
+
+  auto latest = router_.latest_message(*request);
+  if (!latest) {
+    return grpc::Status(
+      grpc::StatusCode::NOT_FOUND,
+      "No matching message received yet"
+    );
+  }
+
+  *response = std::move(*latest);
+  return grpc::Status::OK;
+}
+
 void MavlinkBridgeServiceImpl::shutdown() {
   Logger::Info("Service shutting down, notifying all active streams...");
   shutting_down_.store(true);
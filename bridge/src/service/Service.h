@@ -26,9 +26,11 @@ namespace mav2grpc {
 /**
  * @brief Implementation of MavlinkBridge gRPC service.
  *
- * Provides two RPC methods:
+ * Provides four RPC methods:
  * - StreamMessages: Server-streaming RPC that delivers MAVLink messages to clients
  * - SendMessage: Unary RPC that sends MAVLink messages to connected systems
+ * - SendMessageBatch: Unary RPC that sends several messages in order
+ * - GetLatestMessage: Unary RPC that returns the last received matching message
  *
  * Thread-safe and supports multiple concurrent clients.
  */
@@ -56,6 +58,8 @@ public:
    * @brief Stream MAVLink messages to client.
    *
    * Server-streaming RPC that subscribes client to filtered message stream.
+   * Initial metadata is sent once the subscription is registered, so clients
+   * can await it before sending commands whose replies they need.
    * Runs until client cancels or connection is lost.
    *
    * @param context gRPC context
@@ -83,6 +87,39 @@ public:
     const mavlink::MavlinkMessage* request,
     mavlink::SendResponse* response) override;
 
+  /**
+   * @brief Send several MAVLink messages to connected systems.
+   *
+   * Unary RPC that sends messages in order via MAVLink connection.
+   * All messages are validated before any is sent; sending stops at
+   * the first failure.
+   *
+   * @param context gRPC context
+   * @param request Messages to send
+   * @param response Batch send result
+   * @return gRPC status
+   */
+  grpc::Status SendMessageBatch(
+    grpc::ServerContext* context,
+    const mavlink::MavlinkMessageBatch* request,
+    mavlink::BatchResponse* response) override;
+
+  /**
+   * @brief Get the latest received MAVLink message matching a filter.
+   *
+   * Unary RPC served from the router's latest-message cache, avoiding
+   * the setup cost of a stream for one-shot telemetry reads.
+   *
+   * @param context gRPC context
+   * @param request Filter criteria
+   * @param response Latest matching message
+   * @return gRPC status (NOT_FOUND if no matching message received yet)
+   */
+  grpc::Status GetLatestMessage(
+    grpc::ServerContext* context,
+    const mavlink::StreamFilter* request,
+    mavlink::MavlinkMessage* response) override;
+
   /**
    * @brief Shutdown the service and notify all active streams.
    *
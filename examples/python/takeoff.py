@@ -11,7 +11,15 @@ Usage:
     python3 guided_takeoff.py --altitude 10.0
 """
 
+import os
+
+# Prefer the C (upb) protobuf runtime; must be set before protobuf is imported.
+# protobuf falls back to pure Python if upb is not available.
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
+
+import asyncio
 import grpc
+import logging
 import sys
 import time
 import argparse
@@ -24,95 +32,151 @@ import mavlink_bridge_pb2
 import mavlink_bridge_pb2_grpc
 from mavlink import common_pb2
 
+# Flush small control messages immediately and keep the connection warm,
+# also while idle between missions (every 10 s, well above the bridge's
+# 5 s minimum ping interval)
+_CHANNEL_OPTIONS = [
+    ('grpc.http2.write_buffer_size', 0),
+    ('grpc.keepalive_time_ms', 10_000),
+    ('grpc.keepalive_timeout_ms', 5_000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.http2.min_time_between_pings_ms', 10_000),
+]
 
-def send_command(stub, target_system, target_component, command, params, command_name="command"):
-    """Send a MAVLink command and return response"""
+# Enum value -> name lookups, resolved once instead of per ACK
+_MAV_RESULT_NAMES = {
+    number: value.name
+    for number, value in common_pb2.MavResult.DESCRIPTOR.values_by_number.items()
+}
+_MAV_CMD_NAMES = {
+    number: value.name
+    for number, value in common_pb2.MavCmd.DESCRIPTOR.values_by_number.items()
+}
+
+# A cached position older than this (by its bridge timestamp) is not used
+_MAX_POSITION_AGE = 3.0  # seconds
+
+
+logger = logging.getLogger("takeoff")
+
+# Header shared by every command we send; outgoing messages copy it and
+# set the COMMAND_LONG fields in place instead of going through kwargs
+_CMD_MSG = mavlink_bridge_pb2.MavlinkMessage(
+    system_id=254,
+    component_id=190,
+    message_id=76
+)
+
+
+def command_message(target_system, target_component, command, params):
+    """Build a COMMAND_LONG message"""
     
-    command_long = common_pb2.CommandLong(
-        target_system=target_system,
-        target_component=target_component,
-        command=command,
-        confirmation=0,
-        param1=params[0],
-        param2=params[1],
-        param3=params[2],
-        param4=params[3],
-        param5=params[4],
-        param6=params[5],
-        param7=params[6]
-    )
+    message = mavlink_bridge_pb2.MavlinkMessage()
+    message.CopyFrom(_CMD_MSG)
     
-    message = mavlink_bridge_pb2.MavlinkMessage(
-        system_id=254,
-        component_id=190,
-        message_id=76,
-        command_long=command_long
-    )
+    command_long = message.command_long
+    command_long.target_system = target_system
+    command_long.target_component = target_component
+    command_long.command = command
+    command_long.confirmation = 0
+    (command_long.param1, command_long.param2, command_long.param3,
+     command_long.param4, command_long.param5, command_long.param6,
+     command_long.param7) = params
+    return message
+
+
+async def send_message(stub, message, command_name="command"):
+    """Send a prepared COMMAND_LONG message and return whether it went out"""
     
-    # Debug: print what we're sending
-    print(f"Sending {command_name} command...")
-    print(f"  target: {target_system}/{target_component}")
-    print(f"  command: {command}")
-    print(f"  params: {params}")
+    command_long = message.command_long
+    logger.debug("Sending %s command...", command_name)
+    logger.debug("  target: %s/%s", command_long.target_system, command_long.target_component)
+    logger.debug("  command: %s", command_long.command)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("  params: %s", [
+            command_long.param1, command_long.param2, command_long.param3,
+            command_long.param4, command_long.param5, command_long.param6,
+            command_long.param7,
+        ])
     
-    response = stub.SendMessage(message)
+    response = await stub.SendMessage(message)
     
     if response.success:
-        print(f"✓ {command_name} command sent")
+        logger.info("✓ %s command sent", command_name)
         return True
     else:
-        print(f"✗ Failed to send {command_name}: {response.error}")
+        logger.info("✗ Failed to send %s: %s", command_name, response.error)
         return False
 
 
-def wait_for_ack(stub, command_name, timeout=5.0):
-    """Wait for COMMAND_ACK"""
+async def send_command(stub, target_system, target_component, command, params, command_name="command"):
+    """Send a MAVLink command and return response"""
     
+    message = command_message(target_system, target_component, command, params)
+    return await send_message(stub, message, command_name)
+
+
+async def subscribe_ack(stub, command_name, command=None, timeout=5.0):
+    """
+    Subscribe to COMMAND_ACK (optionally only for the given command ID).
+
+    Returns once the bridge has registered the stream, so a command sent
+    afterwards cannot miss its ACK. The returned task resolves to True if
+    the command was accepted.
+    """
     stream_filter = mavlink_bridge_pb2.StreamFilter(
         system_id=0,
         component_id=0,
         message_ids=[77]  # COMMAND_ACK
     )
     
-    print(f"Waiting for {command_name} ACK (timeout: {timeout}s)...")
-    start_time = time.time()
+    # The deadline is enforced by gRPC and ends the stream with DEADLINE_EXCEEDED
+    call = stub.StreamMessages(stream_filter, timeout=timeout)
+    # The bridge sends initial metadata right after subscribing
+    await call.initial_metadata()
+    return asyncio.create_task(wait_for_ack(call, command_name, command, timeout))
+
+
+async def wait_for_ack(call, command_name, command=None, timeout=5.0):
+    """Wait for COMMAND_ACK on an open stream"""
     
+    logger.debug("Waiting for %s ACK (timeout: %ss)...", command_name, timeout)
     try:
-        for message in stub.StreamMessages(stream_filter):
-            if message.HasField('command_ack'):
+        async for message in call:
+            if message.HasField('command_ack') and (
+                    command is None or message.command_ack.command == command):
                 ack = message.command_ack
-                result_str = common_pb2.MavResult.Name(ack.result)
+                result_str = _MAV_RESULT_NAMES.get(ack.result, f"UNKNOWN_RESULT_{ack.result}")
                 
-                # Try to get command name, fallback to ID if not in enum
-                try:
-                    cmd_name = common_pb2.MavCmd.Name(ack.command)
-                except ValueError:
-                    cmd_name = f"UNKNOWN_CMD_{ack.command}"
+                # Fallback to ID if command is not in enum
+                cmd_name = _MAV_CMD_NAMES.get(ack.command, f"UNKNOWN_CMD_{ack.command}")
                 
-                print(f"  Command: {cmd_name}")
-                print(f"  Result: {result_str}")
+                logger.debug("  Command: %s", cmd_name)
+                logger.debug("  Result: %s", result_str)
                 
                 if ack.result == common_pb2.MAV_RESULT_ACCEPTED:
-                    print(f"✓ {command_name} accepted\n")
+                    logger.info("✓ %s accepted", command_name)
                     return True
                 else:
-                    print(f"✗ {command_name} rejected: {result_str}\n")
+                    logger.info("✗ %s rejected: %s", command_name, result_str)
                     return False
-            
-            if time.time() - start_time > timeout:
-                print(f"✗ Timeout waiting for {command_name} ACK\n")
-                return False
-    except KeyboardInterrupt:
-        print("\nInterrupted by user")
+    except grpc.RpcError as e:
+        if e.code() != grpc.StatusCode.DEADLINE_EXCEEDED:
+            raise
+        logger.info("✗ Timeout waiting for %s ACK", command_name)
         return False
+    finally:
+        call.cancel()
+    return False
 
 
-def set_mode_guided(stub, target_system, target_component):
+async def set_mode_guided(stub, target_system, target_component):
     """Set vehicle mode to GUIDED (not needed for PX4, but harmless)"""
     # MAV_CMD_DO_SET_MODE = 176
     # For PX4: Just use arm + takeoff, mode changes automatically
     # For ArduPilot: param1=1 (custom mode), param2=4 (GUIDED)
-    return send_command(
+    return await send_command(
         stub, target_system, target_component,
         common_pb2.MAV_CMD_DO_SET_MODE,
         [1, 4, 0, 0, 0, 0, 0],
@@ -120,73 +184,67 @@ def set_mode_guided(stub, target_system, target_component):
     )
 
 
-def arm_vehicle(stub, target_system, target_component, force=False):
-    """ARM the vehicle"""
+def arm_command(target_system, target_component, force=False):
+    """Build the ARM command"""
     # MAV_CMD_COMPONENT_ARM_DISARM = 400
     # param1: 1=arm, 0=disarm
     # param2: 0 for normal arming (don't use 21196, some systems don't support it)
-    return send_command(
-        stub, target_system, target_component,
+    return command_message(
+        target_system, target_component,
         common_pb2.MAV_CMD_COMPONENT_ARM_DISARM,
-        [1, 0, 0, 0, 0, 0, 0],
-        "ARM"
+        [1, 0, 0, 0, 0, 0, 0]
     )
 
 
-def get_current_position(stub, timeout=5.0):
-    """Get current latitude and longitude from vehicle (GLOBAL_POSITION_INT)"""
-    stream_filter = mavlink_bridge_pb2.StreamFilter(
-        system_id=0,
-        component_id=0,
-        message_ids=[33]  # GLOBAL_POSITION_INT
-    )
-    print("Reading current position (lat/lon)...")
-    start_time = time.time()
+async def next_message(stub, stream_filter, timeout):
+    """Wait for the next message matching the filter; None on timeout"""
+    if timeout <= 0:
+        return None
+    call = stub.StreamMessages(stream_filter, timeout=timeout)
     try:
-        for message in stub.StreamMessages(stream_filter):
-            if message.HasField('global_position_int'):
-                pos = message.global_position_int
-                lat = pos.lat / 1e7
-                lon = pos.lon / 1e7
-                print(f"Current lat: {lat:.7f}, lon: {lon:.7f}")
-                return lat, lon
-            if time.time() - start_time > timeout:
-                print("⚠ Timeout reading position, using 0/0")
-                return 0.0, 0.0
-    except KeyboardInterrupt:
-        print("\nInterrupted")
-        return 0.0, 0.0
-    
+        async for message in call:
+            return message
+    except grpc.RpcError as e:
+        if e.code() != grpc.StatusCode.DEADLINE_EXCEEDED:
+            raise
+    finally:
+        call.cancel()
+    return None
 
-def get_current_altitude(stub, timeout=5.0):
-    """Get current altitude from vehicle"""
-    
-    # Stream GLOBAL_POSITION_INT messages
+
+async def get_current_state(stub, timeout=5.0):
+    """Get current altitude, latitude and longitude from one GLOBAL_POSITION_INT"""
     stream_filter = mavlink_bridge_pb2.StreamFilter(
         system_id=0,
         component_id=0,
         message_ids=[33]  # GLOBAL_POSITION_INT
     )
-    
-    print("Reading current altitude...")
-    start_time = time.time()
-    
+    logger.debug("Reading current position (alt/lat/lon)...")
+    deadline = time.monotonic() + timeout
     try:
-        for message in stub.StreamMessages(stream_filter):
-            if message.HasField('global_position_int'):
-                pos = message.global_position_int
-                # alt is in millimeters, convert to meters
-                altitude_m = pos.alt / 1000.0
-                print(f"Current altitude: {altitude_m:.2f}m")
-                return altitude_m
-            
-            if time.time() - start_time > timeout:
-                print("⚠ Timeout reading altitude, using default")
-                return 0.0
-                
-    except KeyboardInterrupt:
-        print("\nInterrupted")
-        return 0.0
+        message = await stub.GetLatestMessage(stream_filter, timeout=timeout)
+        age = time.time() - message.timestamp_usec / 1e6
+        if age > _MAX_POSITION_AGE:
+            logger.debug("Cached position is %.1fs old, waiting for a new one", age)
+            message = None
+    except grpc.RpcError as e:
+        if e.code() not in (grpc.StatusCode.NOT_FOUND, grpc.StatusCode.DEADLINE_EXCEEDED):
+            raise
+        message = None
+
+    # Nothing (recent) cached yet, so wait for the next one until the deadline
+    if message is None:
+        message = await next_message(stub, stream_filter, deadline - time.monotonic())
+    if message is None:
+        logger.info("⚠ No position received yet, using defaults")
+        return 0.0, 0.0, 0.0
+    pos = message.global_position_int
+    # alt is in millimeters, convert to meters
+    altitude_m = pos.alt / 1000.0
+    lat = pos.lat / 1e7
+    lon = pos.lon / 1e7
+    logger.info("Current altitude: %.2fm, lat: %.7f, lon: %.7f", altitude_m, lat, lon)
+    return altitude_m, lat, lon
 
 
 def set_takeoff_altitude(stub, target_system, target_component, altitude):
@@ -196,22 +254,71 @@ def set_takeoff_altitude(stub, target_system, target_component, altitude):
     return altitude
 
 
-def takeoff(stub, target_system, target_component, altitude):
-    """Send takeoff command (PX4 uses system parameter for altitude)"""
+def takeoff_command(target_system, target_component, altitude, lat, lon):
+    """Build the takeoff command (PX4 uses system parameter for altitude)"""
     # MAV_CMD_NAV_TAKEOFF = 22
     # For PX4: param7 (altitude) should be set, even if PX4 uses MIS_TAKEOFF_ALT
     # For ArduPilot: param7 = altitude
-    # Read current lat/lon for PX4 compatibility
-    lat, lon = get_current_position(stub)
-    return send_command(
-        stub, target_system, target_component,
+    # lat/lon of the current position are passed for PX4 compatibility
+    return command_message(
+        target_system, target_component,
         common_pb2.MAV_CMD_NAV_TAKEOFF,
-        [0, 0, 0, 0, lat, lon, altitude],
-        f"TAKEOFF (alt: {altitude}m, lat: {lat:.7f}, lon: {lon:.7f})"
+        [0, 0, 0, 0, lat, lon, altitude]
     )
 
 
-def main():
+async def takeoff_sequence(channel, altitude, target_system=1, target_component=1,
+                           force_arm=False):
+    """
+    Run ARM + TAKEOFF over an existing channel.
+
+    TAKEOFF is only sent after ARM was accepted and the vehicle had time to
+    settle. The channel is not closed, so integrators can keep one
+    connection open and reuse it across several missions.
+
+    Returns False if sending failed or ARM was not accepted.
+    """
+    stub = mavlink_bridge_pb2_grpc.MavlinkBridgeStub(channel)
+    tasks = []  # cancelled on exit if still running
+    
+    try:
+        # Subscribe for the ARM ACK before sending so it cannot be missed
+        arm_ack = await subscribe_ack(stub, "ARM", common_pb2.MAV_CMD_COMPONENT_ARM_DISARM)
+        tasks.append(arm_ack)
+        if not await send_message(
+                stub, arm_command(target_system, target_component, force_arm), "ARM"):
+            return False
+
+        # Read position and let the vehicle settle while waiting for the ACK;
+        # a rejected ARM returns right away and cancels both
+        state = asyncio.create_task(get_current_state(stub, timeout=5.0))
+        settle = asyncio.create_task(asyncio.sleep(2.0))
+        tasks += [state, settle]
+        if not await arm_ack:
+            return False
+        logger.info("ARMED.")
+        current_alt, lat, lon = await state
+        await settle
+        target_alt = current_alt + altitude
+        logger.info("Current: %.2fm  Target: %.2fm", current_alt, target_alt)
+
+        takeoff_ack = await subscribe_ack(stub, "TAKEOFF", common_pb2.MAV_CMD_NAV_TAKEOFF)
+        tasks.append(takeoff_ack)
+        if not await send_message(
+                stub, takeoff_command(target_system, target_component, target_alt, lat, lon),
+                "TAKEOFF"):
+            return False
+        if not await takeoff_ack:
+            logger.info("Takeoff might have been rejected.")
+            logger.info("Check if already in air or pre-arm checks failed.")
+        logger.info("TAKEOFF command sent.")
+        return True
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def main():
     parser = argparse.ArgumentParser(description="Guided mode takeoff sequence")
     parser.add_argument("--host", default="localhost:50051",
                        help="gRPC bridge address (default: localhost:50051)")
@@ -223,31 +330,23 @@ def main():
                        help="Target component ID (default: 1)")
     parser.add_argument("--force-arm", action="store_true",
                        help="Force arming (skip pre-arm checks)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                       help="Print sent commands and received ACK details")
     
     args = parser.parse_args()
     
-    print(f"Connecting: {args.host}")
-    channel = grpc.insecure_channel(args.host)
-    stub = mavlink_bridge_pb2_grpc.MavlinkBridgeStub(channel)
+    # Log to stdout so messages stay in order with the prints below
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
     
+    print(f"Connecting: {args.host}")
     try:
-        # Get current altitude first
-        current_alt = get_current_altitude(stub, timeout=5.0)
-        target_alt = current_alt + args.altitude
-        print(f"Current: {current_alt:.2f}m  Target: {target_alt:.2f}m")
-        if not arm_vehicle(stub, args.system, args.component, args.force_arm):
-            return 1
-        if not wait_for_ack(stub, "ARM"):
-            return 1
-        print("ARMED.")
-        time.sleep(2.0)
-        if not takeoff(stub, args.system, args.component, target_alt):
-            return 1
-        if not wait_for_ack(stub, "TAKEOFF"):
-            print("Takeoff might have been rejected.")
-            print("Check if already in air or pre-arm checks failed.")
-        print("TAKEOFF command sent.")
-        
+        async with grpc.aio.insecure_channel(args.host, options=_CHANNEL_OPTIONS) as channel:
+            ok = await takeoff_sequence(
+                channel, args.altitude,
+                args.system, args.component, args.force_arm)
+            return 0 if ok else 1
     except grpc.RpcError as e:
         print(f"✗ gRPC error: {e.code()} - {e.details()}")
         return 1
@@ -256,11 +355,11 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
-    finally:
-        channel.close()
-    
-    return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        print("\nInterrupted by user")
+        sys.exit(1)
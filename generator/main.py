@@ -2,6 +2,9 @@
 """
 MAVLink to Protocol Buffer Generator - Interactive CLI
 """
+import argparse
+import os
+import re
 import sys
 from pathlib import Path
 
@@ -9,23 +12,32 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from src.parser import MAVLinkParser
 from src.generator import ProtoGenerator
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt
-from rich.table import Table
 
-console = Console()
+# Strips rich markup tags for plain output
+_MARKUP_RE = re.compile(r"\[/?[a-z ]+\]")
 
+DIALECTS = ["minimal", "standard", "common"]
 
-def main():
-    # Header
-    console.print(Panel.fit(
-        "[bold cyan]MAVLink to Protocol Buffer Generator[/bold cyan]",
-        border_style="cyan"
-    ))
-    console.print()
 
-    # Ask user which dialect to generate
+def plain_print(text: str = "") -> None:
+    """Print rich-style markup text without styling."""
+    print(_MARKUP_RE.sub("", text))
+
+
+def use_rich(args: argparse.Namespace) -> bool:
+    """Interactive rich UI only when no dialect is given and stdout is a TTY."""
+    return (
+        args.dialect is None
+        and sys.stdout.isatty()
+        and not os.environ.get("NO_RICH")
+    )
+
+
+def ask_dialect(console) -> str:
+    """Ask the user which dialect to generate."""
+    from rich.prompt import Prompt
+    from rich.table import Table
+
     console.print("[bold]Which dialect would you like to generate?[/bold]\n")
 
     table = Table(show_header=False, box=None, padding=(0, 2))
@@ -53,56 +65,93 @@ def main():
         "2": "standard",
         "3": "common",
     }
-    selected_dialect = dialect_map[choice]
+    return dialect_map[choice]
 
-    console.print(f"\n[cyan]Selected dialect:[/cyan] {selected_dialect}\n")
+
+def main():
+    # rich (and pygments behind it) is only imported for interactive runs;
+    # --dialect, non-TTY and NO_RICH runs print plain text instead
+    arg_parser = argparse.ArgumentParser(description="MAVLink to Protocol Buffer Generator")
+    arg_parser.add_argument("--dialect", choices=DIALECTS,
+                            help="Dialect to generate (skips the interactive prompt)")
+    args = arg_parser.parse_args()
+
+    if use_rich(args):
+        from rich.console import Console
+        from rich.panel import Panel
+
+        console = Console()
+        echo = console.print
+
+        # Header
+        console.print(Panel.fit(
+            "[bold cyan]MAVLink to Protocol Buffer Generator[/bold cyan]",
+            border_style="cyan"
+        ))
+        console.print()
+
+        selected_dialect = ask_dialect(console)
+    else:
+        console = None
+        echo = plain_print
+        selected_dialect = args.dialect or "common"
+
+    echo(f"\n[cyan]Selected dialect:[/cyan] {selected_dialect}\n")
 
     # Setup paths
     xml_dir = Path(__file__).parent.parent / "mavlink" / "message_definitions" / "v1.0"
     output_dir = Path(__file__).parent.parent / "proto"
     template_dir = Path(__file__).parent / "templates"
+    parse_cache = Path(__file__).parent / ".cache" / "mavlink_ast.pkl"
 
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Parse dialect (with includes merged)
-    console.print("[bold]Parsing dialect (including dependencies)...[/bold]")
+    echo("[bold]Parsing dialect (including dependencies)...[/bold]")
     mavlink_parser = MAVLinkParser(xml_dir)
+    mavlink_parser.load_cache(parse_cache)
 
     try:
         dialect = mavlink_parser.get_flattened_dialect(selected_dialect)
-        console.print(f"  [green]✓[/green] {selected_dialect}: {len(dialect.enums)} enums, {len(dialect.messages)} messages")
+        echo(f"  [green]✓[/green] {selected_dialect}: {len(dialect.enums)} enums, {len(dialect.messages)} messages")
     except Exception as e:
-        console.print(f"  [red]✗[/red] {selected_dialect}: ERROR - {e}")
+        echo(f"  [red]✗[/red] {selected_dialect}: ERROR - {e}")
         return 1
 
+    # The cache only speeds up the next run, so failing to write it is not fatal
+    try:
+        mavlink_parser.save_cache(parse_cache)
+    except OSError as e:
+        echo(f"  [yellow]⚠[/yellow] Could not save parse cache: {e}")
+
     # Generate proto file
-    console.print(f"\n[bold]Generating proto file...[/bold]")
+    echo(f"\n[bold]Generating proto file...[/bold]")
     proto_gen = ProtoGenerator(template_dir, mavlink_parser)
 
     try:
         proto_gen.generate_all([dialect], output_dir)
-        console.print(f"  [green]✓[/green] Generated {selected_dialect}.proto")
-        console.print(f"  [green]✓[/green] Generated bridge service proto")
+        echo(f"  [green]✓[/green] Generated {selected_dialect}.proto")
+        echo(f"  [green]✓[/green] Generated bridge service proto")
     except Exception as e:
-        console.print(f"  [red]✗[/red] ERROR: {e}")
+        echo(f"  [red]✗[/red] ERROR: {e}")
         import traceback
         traceback.print_exc()
         return 1
 
     # Generate C++ message converter
-    console.print(f"\n[bold]Generating C++ MessageConverter...[/bold]")
+    echo(f"\n[bold]Generating C++ MessageConverter...[/bold]")
     converter_output = Path(__file__).parent.parent / "bridge" / "src" / "mavlink"
-    
+
     try:
         proto_gen.generate_message_converter(
             {selected_dialect: dialect},
             converter_output
         )
-        console.print(f"  [green]✓[/green] Generated MessageConverter.h")
-        console.print(f"  [green]✓[/green] Generated MessageConverter.cc")
+        echo(f"  [green]✓[/green] Generated MessageConverter.h")
+        echo(f"  [green]✓[/green] Generated MessageConverter.cc")
     except Exception as e:
-        console.print(f"  [red]✗[/red] ERROR: {e}")
+        echo(f"  [red]✗[/red] ERROR: {e}")
         import traceback
         traceback.print_exc()
         return 1
@@ -110,14 +159,17 @@ def main():
     # Summary
     total_enums = len(dialect.enums)
     total_messages = len(dialect.messages)
-
-    console.print()
-    console.print(Panel.fit(
+    summary = (
         f"[bold green]Successfully completed![/bold green]\n\n"
         f"Output directory: [cyan]{output_dir}[/cyan]\n"
-        f"Total: [yellow]{total_enums}[/yellow] enums, [yellow]{total_messages}[/yellow] messages",
-        border_style="green"
-    ))
+        f"Total: [yellow]{total_enums}[/yellow] enums, [yellow]{total_messages}[/yellow] messages"
+    )
+
+    echo()
+    if console is not None:
+        console.print(Panel.fit(summary, border_style="green"))
+    else:
+        echo(summary)
 
     return 0
 
@@ -126,5 +178,5 @@ if __name__ == "__main__":
     try:
         sys.exit(main())
     except KeyboardInterrupt:
-        console.print("\n\n[yellow]Operation cancelled.[/yellow]")
+        print("\n\nOperation cancelled.")
         sys.exit(1)
@@ -1,12 +1,113 @@
 """
 Protocol Buffer (.proto) file generator.
 """
+import filecmp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List
-from jinja2 import Environment, FileSystemLoader
+from typing import Dict, List, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2.environment import TemplateStream
 
 from .models import MAVLinkDialect
-from .type_converter import TypeConverter
+from .type_converter import (
+    format_comment,
+    get_field_type_info,
+    sanitize_enum_name,
+    sanitize_field_name,
+    sanitize_message_name,
+    to_proto_type,
+)
+
+
+def _resolve_enum_package(enum_name: str, current_dialect_name: str) -> str:
+    """
+    Resolve enum reference - just sanitize the name.
+    No cross-package resolution needed since dialects are flattened.
+    """
+    return sanitize_enum_name(enum_name)
+
+
+def _write_if_changed(path: Path, stream: TemplateStream) -> bool:
+    """
+    Stream rendered output to path unless the file already holds exactly that content.
+
+    Output is streamed to a temporary file next to path, so the full text
+    is never held in memory. It replaces path only if the content differs.
+    Leaving unchanged files untouched keeps their mtime stable, so protoc and
+    C++ build steps that depend on them are not re-run.
+
+    Args:
+        path: Output file path
+        stream: Template stream (from Template.stream)
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        tmp_file = open(tmp_path, "wb")
+    except FileNotFoundError:
+        # Parent directory is only created the first time it is missing
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = open(tmp_path, "wb")
+
+    try:
+        # Encoded by Jinja; binary mode keeps newlines untranslated
+        with tmp_file:
+            stream.dump(tmp_file, encoding="utf-8")
+
+        if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+            tmp_path.unlink()
+            return False
+
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+# Per-process generator used by generate_all's worker pool
+_worker_generator: Optional["ProtoGenerator"] = None
+
+
+def _init_worker(template_dir: Path) -> None:
+    """Build the generator (and Jinja environment) once per worker process."""
+    global _worker_generator
+    _worker_generator = ProtoGenerator(template_dir)
+
+
+def _generate_dialect_in_worker(dialect: MAVLinkDialect, output_file: Path) -> None:
+    """Render one dialect proto in a worker process."""
+    assert _worker_generator is not None, "worker not initialized"
+    _worker_generator.generate_dialect_proto(dialect, output_file)
+
+
+@dataclass(slots=True)
+class EnrichedField:
+    """Message field with C++ type info, as consumed by converter templates."""
+    name: str
+    proto_name: str
+    type: str
+    description: Optional[str]
+    is_array: bool
+    array_length: Optional[int]
+    base_type: str
+    type_info: dict
+
+
+@dataclass(slots=True)
+class EnrichedMessage:
+    """Message tagged with its dialect, as consumed by converter templates."""
+    name: str
+    proto_name: str
+    id: int
+    dialect: str
+    fields: List[EnrichedField]
+    description: Optional[str]
 
 
 class ProtoGenerator:
@@ -20,23 +121,42 @@ class ProtoGenerator:
             template_dir: Directory containing .proto.j2 templates
             parser: Optional MAVLinkParser for resolving includes
         """
+        # Compiled template bytecode is shared between runs; override the
+        # location with MAVLINK2GRPC_JINJA_CACHE (e.g. a CI cache directory)
+        cache_dir = os.environ.get("MAVLINK2GRPC_JINJA_CACHE")
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
         self.env = Environment(
             loader=FileSystemLoader(str(template_dir)),
             trim_blocks=True,
             lstrip_blocks=True,
+            # Templates don't change during a run: skip mtime checks and
+            # keep every loaded template in memory
+            auto_reload=False,
+            cache_size=-1,
+            bytecode_cache=FileSystemBytecodeCache(cache_dir),
         )
 
         # Register custom functions for templates
         self.env.globals.update({
-            "sanitize_enum_name": TypeConverter.sanitize_enum_name,
-            "sanitize_message_name": TypeConverter.sanitize_message_name,
-            "sanitize_field_name": TypeConverter.sanitize_field_name,
-            "to_proto_type": TypeConverter.to_proto_type,
-            "format_comment": TypeConverter.format_comment,
+            "sanitize_enum_name": sanitize_enum_name,
+            "sanitize_message_name": sanitize_message_name,
+            "sanitize_field_name": sanitize_field_name,
+            "to_proto_type": to_proto_type,
+            "format_comment": format_comment,
+            "resolve_enum_package": _resolve_enum_package,
         })
 
+        self.template_dir = Path(template_dir)
         self.parser = parser
 
+        # Resolve templates once instead of per generate_* call
+        self._dialect_tpl = self.env.get_template("dialect.proto.j2")
+        self._bridge_tpl = self.env.get_template("bridge_service.proto.j2")
+        self._header_tpl = self.env.get_template("message_converter.h.j2")
+        self._impl_tpl = self.env.get_template("message_converter.cc.j2")
+
     def generate_dialect_proto(
         self,
         dialect: MAVLinkDialect,
@@ -49,25 +169,19 @@ class ProtoGenerator:
             dialect: Parsed MAVLink dialect (should be flattened with includes merged)
             output_file: Output .proto file path
         """
-        # Load template
-        template = self.env.get_template("dialect.proto.j2")
-
-        # Render template
-        content = template.render(dialect=dialect)
-
-        # Ensure output directory exists
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Write file
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        print(f"✓ Generated {output_file}")
+        # Render template and write file (skipped if unchanged)
+        stream = self._dialect_tpl.stream(
+            dialect=dialect,
+            current_dialect_name=dialect.name,
+        )
+        status = "Generated" if _write_if_changed(output_file, stream) else "Unchanged"
+        print(f"✓ {status} {output_file}")
 
     def generate_bridge_service(
         self,
         dialects: Dict[str, MAVLinkDialect],
-        output_file: Path
+        output_file: Path,
+        dialect_names: Optional[List[str]] = None
     ) -> None:
         """
         Generate the bridge service .proto file.
@@ -75,30 +189,34 @@ class ProtoGenerator:
         Args:
             dialects: Dictionary of dialect_name -> MAVLinkDialect
             output_file: Output .proto file path
+            dialect_names: Sorted dialect names (computed from dialects if omitted)
         """
-        # Load template
-        template = self.env.get_template("bridge_service.proto.j2")
-
-        # Render template
-        content = template.render(
-            dialect_names=sorted(dialects.keys()),
-            dialects=dialects,
-            sanitize_message_name=TypeConverter.sanitize_message_name,
-        )
-
-        # Ensure output directory exists
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Write file
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        print(f"✓ Generated {output_file}")
+        if dialect_names is None:
+            dialect_names = sorted(dialects.keys())
+
+        # Project each dialect to its oneof payload fields up front:
+        # (dialect_name, [(message proto name, field name, field number), ...])
+        entries = [
+            (
+                dialect_name,
+                [
+                    (message.proto_name, message.name.lower(), 100 + msg_id)
+                    for msg_id, message in dialects[dialect_name].messages.items()
+                ],
+            )
+            for dialect_name in dialect_names
+        ]
+
+        # Render template and write file (skipped if unchanged)
+        stream = self._bridge_tpl.stream(entries=entries)
+        status = "Generated" if _write_if_changed(output_file, stream) else "Unchanged"
+        print(f"✓ {status} {output_file}")
 
     def generate_all(
         self,
         dialects: List[MAVLinkDialect],
-        output_dir: Path
+        output_dir: Path,
+        max_workers: Optional[int] = 1
     ) -> None:
         """
         Generate all .proto files for given dialects.
@@ -106,30 +224,38 @@ class ProtoGenerator:
         Args:
             dialects: List of parsed MAVLink dialects (should be flattened)
             output_dir: Output directory for .proto files
+            max_workers: Worker processes for rendering dialect protos
+                (1 = render in this process, None = one per CPU). Callers
+                using more than one must guard their entry point with
+                `if __name__ == "__main__"`.
         """
-        dialect_dict = {}
-
-        # Simple enum resolution - no cross-package references needed
-        # All enums are in the same package now (flattened)
-        def resolve_enum_package(enum_name: str, current_dialect_name: str) -> str:
-            """
-            Resolve enum reference - just sanitize the name.
-            No cross-package resolution needed since dialects are flattened.
-            """
-            return TypeConverter.sanitize_enum_name(enum_name)
-
-        # Update template globals
-        self.env.globals["resolve_enum_package"] = resolve_enum_package
-
-        # Generate individual dialect protos
-        for dialect in dialects:
-            proto_file = output_dir / "mavlink" / f"{dialect.name}.proto"
-            self.generate_dialect_proto(dialect, proto_file)
-            dialect_dict[dialect.name] = dialect
+        # Generate individual dialect protos. Rendering is CPU-bound, so
+        # with max_workers != 1 several dialects are spread over worker
+        # processes; each worker builds its own generator since Jinja
+        # environments can't be pickled
+        proto_files = [output_dir / "mavlink" / f"{dialect.name}.proto" for dialect in dialects]
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        workers = min(max_workers, len(dialects))
+
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.template_dir,),
+            ) as executor:
+                list(executor.map(_generate_dialect_in_worker, dialects, proto_files))
+        else:
+            for dialect, proto_file in zip(dialects, proto_files):
+                self.generate_dialect_proto(dialect, proto_file)
+
+        dialect_dict = {dialect.name: dialect for dialect in dialects}
+        dialect_names = sorted(dialect_dict.keys())
 
         # Generate bridge service proto
         bridge_file = output_dir / "mavlink_bridge.proto"
-        self.generate_bridge_service(dialect_dict, bridge_file)
+        self.generate_bridge_service(dialect_dict, bridge_file, dialect_names)
 
         print(f"\n✓ Generated {len(dialects)} dialect proto(s) + 1 bridge service")
         print(f"  Output directory: {output_dir}")
@@ -137,7 +263,8 @@ class ProtoGenerator:
     def generate_message_converter(
         self,
         dialects: Dict[str, MAVLinkDialect],
-        output_dir: Path
+        output_dir: Path,
+        dialect_names: Optional[List[str]] = None
     ) -> None:
         """
         Generate C++ MessageConverter header and implementation.
@@ -145,66 +272,63 @@ class ProtoGenerator:
         Args:
             dialects: Dictionary of dialect_name -> MAVLinkDialect
             output_dir: Output directory for .h and .cc files
+            dialect_names: Sorted dialect names (computed from dialects if omitted)
         """
+        if dialect_names is None:
+            dialect_names = sorted(dialects.keys())
+
         # Collect all messages from all dialects
         all_messages = []
         for dialect_name, dialect in dialects.items():
-            for msg_id, msg in dialect.messages.items():
+            for msg in dialect.messages.values():
                 # Enrich fields with type info
                 enriched_fields = []
                 for field in msg.fields:
-                    field_dict = {
-                        'name': field.name,
-                        'type': field.type,
-                        'description': field.description,
-                        'is_array': field.is_array,
-                        'array_length': field.array_length,
-                        'base_type': field.base_type,
-                        'type_info': TypeConverter.get_field_type_info(
-                            field.type, 
+                    enriched_fields.append(EnrichedField(
+                        name=field.name,
+                        proto_name=field.proto_name,
+                        type=field.type,
+                        description=field.description,
+                        is_array=field.is_array,
+                        array_length=field.array_length,
+                        base_type=field.base_type,
+                        type_info=get_field_type_info(
+                            field.type,
                             field.enum
-                        )
-                    }
-                    enriched_fields.append(field_dict)
+                        ),
+                    ))
 
                 # Add dialect name to message for template
-                msg_with_dialect = {
-                    'name': msg.name,
-                    'id': msg.id,
-                    'dialect': dialect_name,
-                    'fields': enriched_fields,
-                    'description': msg.description,
-                }
-                all_messages.append(msg_with_dialect)
+                all_messages.append(EnrichedMessage(
+                    name=msg.name,
+                    proto_name=msg.proto_name,
+                    id=msg.id,
+                    dialect=dialect_name,
+                    fields=enriched_fields,
+                    description=msg.description,
+                ))
 
         # Sort by message ID for cleaner generated code
-        all_messages.sort(key=lambda m: m['id'])
+        all_messages.sort(key=attrgetter('id'))
 
         # Generate header
-        header_template = self.env.get_template("message_converter.h.j2")
-        header_content = header_template.render(
-            dialect_names=sorted(dialects.keys()),
+        header_stream = self._header_tpl.stream(
+            dialect_names=dialect_names,
             messages=all_messages,
         )
 
         header_file = output_dir / "MessageConverter.h"
-        header_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(header_file, "w", encoding="utf-8") as f:
-            f.write(header_content)
-
-        print(f"✓ Generated {header_file}")
+        status = "Generated" if _write_if_changed(header_file, header_stream) else "Unchanged"
+        print(f"✓ {status} {header_file}")
 
         # Generate implementation
-        impl_template = self.env.get_template("message_converter.cc.j2")
-        impl_content = impl_template.render(
-            dialect_names=sorted(dialects.keys()),
+        impl_stream = self._impl_tpl.stream(
+            dialect_names=dialect_names,
             messages=all_messages,
         )
 
         impl_file = output_dir / "MessageConverter.cc"
-        with open(impl_file, "w", encoding="utf-8") as f:
-            f.write(impl_content)
-
-        print(f"✓ Generated {impl_file}")
+        status = "Generated" if _write_if_changed(impl_file, impl_stream) else "Unchanged"
+        print(f"✓ {status} {impl_file}")
         print(f"  Converter supports {len(all_messages)} message types")
 
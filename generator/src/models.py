@@ -1,12 +1,20 @@
 """
 Data models for MAVLink XML structures.
 """
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
+from .type_converter import (
+    sanitize_enum_name,
+    sanitize_field_name,
+    sanitize_message_name,
+)
 
-class EnumEntry(BaseModel):
-    """Represents a single enum entry."""
+
+@dataclass(slots=True, frozen=True)
+class EnumEntry:
+    """Represents a single enum entry (immutable)."""
     value: int
     name: str
     description: Optional[str] = None
@@ -22,10 +30,23 @@ class Enum(BaseModel):
     entries: List[EnumEntry] = Field(default_factory=list)
     deprecated: Optional[str] = None
     replaced_by: Optional[str] = None
+    proto_name: str = ""  # e.g., "MavType"; derived from name if not given
+
+    @model_validator(mode='after')
+    def _default_proto_name(self) -> 'Enum':
+        """Fill proto_name from name when the parser did not set it."""
+        if not self.proto_name:
+            self.proto_name = sanitize_enum_name(self.name)
+        return self
 
 
-class MessageField(BaseModel):
-    """Represents a field in a MAVLink message."""
+@dataclass(slots=True, frozen=True)
+class MessageField:
+    """
+    Represents a field in a MAVLink message.
+
+    Immutable, so the fields derived from `type` and `name` can't go stale.
+    """
     type: str  # e.g., "uint8_t", "float", "char[16]"
     name: str
     enum: Optional[str] = None  # Reference to enum name
@@ -33,28 +54,30 @@ class MessageField(BaseModel):
     description: Optional[str] = None
     invalid: Optional[str] = None  # Invalid value indicator
     print_format: Optional[str] = None
+    proto_name: str = ""  # e.g., "base_mode"; derived from name if not given
+
+    # Derived from `type` in __post_init__ (e.g., char[16] -> "char", 16, True)
+    base_type: str = field(default="", init=False, repr=False, compare=False)
+    array_length: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    is_array: bool = field(default=False, init=False, repr=False, compare=False)
 
-    # Computed properties
-    @property
-    def is_array(self) -> bool:
-        """Check if field is an array type (e.g., char[16], uint8_t[8])."""
-        return '[' in self.type and ']' in self.type
-
-    @property
-    def array_length(self) -> Optional[int]:
-        """Extract array length if this is an array field."""
-        if not self.is_array:
-            return None
-        start = self.type.index('[')
-        end = self.type.index(']')
-        return int(self.type[start + 1:end])
-
-    @property
-    def base_type(self) -> str:
-        """Get the base type without array notation."""
-        if self.is_array:
-            return self.type[:self.type.index('[')]
-        return self.type
+    def __post_init__(self) -> None:
+        """
+        Split `type` into base type and array length (e.g., char[16] -> char, 16)
+        and fill proto_name from name when the parser did not set it.
+        """
+        # Frozen, so the derived fields are set through object.__setattr__
+        if not self.proto_name:
+            object.__setattr__(self, 'proto_name', sanitize_field_name(self.name))
+
+        start = self.type.find('[')
+        end = self.type.find(']')
+        if start != -1 and end != -1:
+            object.__setattr__(self, 'base_type', self.type[:start])
+            object.__setattr__(self, 'array_length', int(self.type[start + 1:end]))
+            object.__setattr__(self, 'is_array', True)
+        else:
+            object.__setattr__(self, 'base_type', self.type)
 
 
 class Message(BaseModel):
@@ -67,6 +90,14 @@ class Message(BaseModel):
     superseded: Optional[str] = None
     replaced_by: Optional[str] = None
     wip: bool = False  # Work in progress flag
+    proto_name: str = ""  # e.g., "GlobalPositionInt"; derived from name if not given
+
+    @model_validator(mode='after')
+    def _default_proto_name(self) -> 'Message':
+        """Fill proto_name from name when the parser did not set it."""
+        if not self.proto_name:
+            self.proto_name = sanitize_message_name(self.name)
+        return self
 
 
 class MAVLinkDialect(BaseModel):
@@ -79,12 +110,27 @@ class MAVLinkDialect(BaseModel):
     enums: Dict[str, Enum] = Field(default_factory=dict)
     messages: Dict[int, Message] = Field(default_factory=dict)
 
+    # Name -> message index for get_message_by_name, maintained by add_message
+    _messages_by_name: Dict[str, Message] = PrivateAttr(default_factory=dict)
+
+    def add_message(self, message: Message) -> None:
+        """Add (or replace) a message, keeping the name index up to date."""
+        self.messages[message.id] = message
+        self._messages_by_name[message.name] = message
+
     def get_message_by_name(self, name: str) -> Optional[Message]:
         """Find message by name."""
-        for msg in self.messages.values():
-            if msg.name == name:
-                return msg
-        return None
+        index = self._messages_by_name
+        msg = index.get(name)
+        stale = (
+            self.messages.get(msg.id) is not msg if msg is not None
+            else len(index) != len(self.messages)
+        )
+        if stale:
+            # messages was modified directly, bypassing add_message: rebuild
+            index = self._messages_by_name = {m.name: m for m in self.messages.values()}
+            msg = index.get(name)
+        return msg
 
     def get_enum_by_name(self, name: str) -> Optional[Enum]:
         """Find enum by name."""
@@ -1,8 +1,13 @@
 """
 MAVLink XML parser.
 """
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Set, List
+from typing import Dict, Set, List, Tuple
 from lxml import etree
 
 from .models import (
@@ -12,11 +17,63 @@ from .models import (
     Message,
     MessageField,
 )
+from .type_converter import (
+    sanitize_enum_name,
+    sanitize_field_name,
+    sanitize_message_name,
+)
+
+
+def _index_children(elem: etree._Element, repeated: str) -> Tuple[Dict[str, etree._Element], List[etree._Element]]:
+    """
+    Collect an element's children in a single pass.
+
+    Args:
+        elem: Parent element
+        repeated: Tag of the children to collect as a list (e.g., "field")
+
+    Returns:
+        First child per tag, and all `repeated` children in document order
+    """
+    first: Dict[str, etree._Element] = {}
+    items: List[etree._Element] = []
+    for child in elem:
+        tag = child.tag
+        if tag == repeated:
+            items.append(child)
+        elif tag not in first:
+            first[tag] = child
+    return first, items
+
+
+# Modules whose code shapes the cached dialects (parsing, model layout and
+# derived names such as proto_name)
+_CACHE_SOURCES = ('parser.py', 'models.py', 'type_converter.py')
+
+
+@lru_cache(maxsize=None)
+def _source_fingerprint() -> str:
+    """Hash of the _CACHE_SOURCES files, so code changes invalidate the parse cache."""
+    digest = hashlib.sha256()
+    src_dir = Path(__file__).parent
+    for name in _CACHE_SOURCES:
+        digest.update(name.encode())
+        try:
+            digest.update((src_dir / name).read_bytes())
+        except OSError:
+            pass
+    return digest.hexdigest()
 
 
 class MAVLinkParser:
     """Parser for MAVLink XML definition files."""
 
+    # Elements handled while streaming a dialect file in parse_file
+    _ITERPARSE_TAGS = ('version', 'dialect', 'include', 'enum', 'message')
+
+    # Bump when the models change so stale parse caches are ignored
+    _CACHE_VERSION = 1
+
     def __init__(self, xml_dir: Path):
         """
         Initialize parser.
@@ -27,6 +84,62 @@ class MAVLinkParser:
         self.xml_dir = Path(xml_dir)
         self.parsed_dialects: Dict[str, MAVLinkDialect] = {}
 
+        # XML file path -> ((mtime_ns, size), parsed dialect), see load_cache
+        self._cache: Dict[str, Tuple[Tuple[int, int], MAVLinkDialect]] = {}
+
+        # (base, *includes) -> result of merge_dialects
+        self._merged_cache: Dict[Tuple[str, ...], MAVLinkDialect] = {}
+
+    def load_cache(self, path: Path) -> None:
+        """
+        Load dialects parsed by a previous run.
+
+        Cached dialects are only reused while their XML file keeps the same
+        mtime and size, and only if the cache was written by the same parser,
+        model and type converter code. A missing, unreadable or outdated
+        cache is ignored.
+        The cache is a pickle, so only load files written by save_cache.
+
+        Args:
+            path: Cache file path
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            if (data['version'] == self._CACHE_VERSION
+                    and data['source'] == _source_fingerprint()):
+                self._cache = dict(data['dialects'])
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                ValueError, TypeError, KeyError):
+            return
+
+    def save_cache(self, path: Path) -> None:
+        """
+        Save all parsed dialects for reuse by load_cache.
+
+        Args:
+            path: Cache file path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = {
+            'version': self._CACHE_VERSION,
+            'source': _source_fingerprint(),
+            'dialects': self._cache,
+        }
+        # Unique temp file in the same directory, so concurrent runs don't
+        # write into each other's file and the replace stays atomic
+        tmp_file = tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix='.tmp', delete=False)
+        try:
+            with tmp_file:
+                pickle.dump(data, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file.name, path)
+        except BaseException:
+            os.unlink(tmp_file.name)
+            raise
+
     def get_all_includes(self, dialect_name: str, visited=None) -> List[str]:
         """
         Get all includes (transitive) for a dialect.
@@ -79,53 +192,63 @@ class MAVLinkParser:
             return self.parsed_dialects[dialect_name]
 
         file_path = self.xml_dir / xml_file
-        if not file_path.exists():
-            raise FileNotFoundError(f"MAVLink XML file not found: {file_path}")
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"MAVLink XML file not found: {file_path}") from None
+
+        # Reuse the dialect from the parse cache if the file is unchanged
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(str(file_path))
+        if cached is not None and cached[0] == cache_key:
+            dialect = cached[1]
+        else:
+            dialect = self._parse_xml(dialect_name, file_path)
+            self._cache[str(file_path)] = (cache_key, dialect)
+
+        # Cache the parsed dialect
+        self.parsed_dialects[dialect_name] = dialect
 
-        # Parse XML
-        tree = etree.parse(str(file_path))
-        root = tree.getroot()
+        # Recursively parse includes
+        for include_file in dialect.includes:
+            self.parse_file(include_file)
+
+        return dialect
 
+    def _parse_xml(self, dialect_name: str, file_path: Path) -> MAVLinkDialect:
+        """Parse a dialect XML file into a new MAVLinkDialect."""
         # Create dialect object
         dialect = MAVLinkDialect(
             name=dialect_name,
             file_path=str(file_path),
         )
 
-        # Parse top-level attributes
-        version_elem = root.find('version')
-        if version_elem is not None and version_elem.text:
-            dialect.version = int(version_elem.text, 0)
-
-        dialect_elem = root.find('dialect')
-        if dialect_elem is not None and dialect_elem.text:
-            dialect.dialect = int(dialect_elem.text, 0)
-
-        # Parse includes
-        for include_elem in root.findall('include'):
-            if include_elem.text:
-                dialect.includes.append(include_elem.text)
-
-        # Parse enums
-        enums_elem = root.find('enums')
-        if enums_elem is not None:
-            for enum_elem in enums_elem.findall('enum'):
-                enum = self._parse_enum(enum_elem)
-                dialect.enums[enum.name] = enum
-
-        # Parse messages
-        messages_elem = root.find('messages')
-        if messages_elem is not None:
-            for message_elem in messages_elem.findall('message'):
-                message = self._parse_message(message_elem)
-                dialect.messages[message.id] = message
-
-        # Cache the parsed dialect
-        self.parsed_dialects[dialect_name] = dialect
+        # Stream the XML in a single pass: each element is handled at its end
+        # event, and enums/messages are released once parsed
+        for _, elem in etree.iterparse(str(file_path), events=('end',), tag=self._ITERPARSE_TAGS):
+            parent = elem.getparent()
 
-        # Recursively parse includes
-        for include_file in dialect.includes:
-            self.parse_file(include_file)
+            if elem.tag == 'enum' and parent.tag == 'enums':
+                enum = self._parse_enum(elem)
+                dialect.enums[enum.name] = enum
+            elif elem.tag == 'message' and parent.tag == 'messages':
+                message = self._parse_message(elem)
+                dialect.add_message(message)
+            else:
+                # Top-level attributes and includes (direct children of root)
+                if parent.getparent() is None and elem.text:
+                    if elem.tag == 'version':
+                        dialect.version = int(elem.text, 0)
+                    elif elem.tag == 'dialect':
+                        dialect.dialect = int(elem.text, 0)
+                    elif elem.tag == 'include':
+                        dialect.includes.append(elem.text)
+                continue
+
+            # Free the parsed subtree and already handled siblings
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
 
         return dialect
 
@@ -169,11 +292,12 @@ class MAVLinkParser:
             # Merge messages (included messages go first, can be overridden)
             for msg_id, message in included_dialect.messages.items():
                 if msg_id not in flattened.messages:
-                    flattened.messages[msg_id] = message
+                    flattened.add_message(message)
 
         # Add this dialect's own enums and messages (overrides included)
         flattened.enums.update(base_dialect.enums)
-        flattened.messages.update(base_dialect.messages)
+        for message in base_dialect.messages.values():
+            flattened.add_message(message)
 
         return flattened
 
@@ -181,13 +305,14 @@ class MAVLinkParser:
         """Parse an <enum> element."""
         name = elem.get('name', '')
         is_bitmask = elem.get('bitmask') == 'true'
+        children, entry_elems = _index_children(elem, 'entry')
 
         # Parse description
-        desc_elem = elem.find('description')
+        desc_elem = children.get('description')
         description = desc_elem.text.strip() if desc_elem is not None and desc_elem.text else None
 
         # Parse deprecated info
-        deprecated_elem = elem.find('deprecated')
+        deprecated_elem = children.get('deprecated')
         deprecated = None
         replaced_by = None
         if deprecated_elem is not None:
@@ -195,31 +320,33 @@ class MAVLinkParser:
             replaced_by = deprecated_elem.get('replaced_by')
 
         # Parse entries
-        entries = []
-        for entry_elem in elem.findall('entry'):
-            entry = self._parse_enum_entry(entry_elem)
-            entries.append(entry)
+        parse_entry = self._parse_enum_entry
+        entries = [parse_entry(entry_elem) for entry_elem in entry_elems]
 
-        return Enum(
+        # Values come straight from the XML and are already the right types,
+        # so pydantic validation is skipped
+        return Enum.model_construct(
             name=name,
             description=description,
             is_bitmask=is_bitmask,
             entries=entries,
             deprecated=deprecated,
             replaced_by=replaced_by,
+            proto_name=sanitize_enum_name(name),
         )
 
     def _parse_enum_entry(self, elem: etree._Element) -> EnumEntry:
         """Parse an <entry> element within an enum."""
         value = int(elem.get('value', '0'), 0)  # base=0 auto-detects hex (0x), octal (0o), decimal
         name = elem.get('name', '')
+        children, _ = _index_children(elem, 'param')
 
         # Parse description
-        desc_elem = elem.find('description')
+        desc_elem = children.get('description')
         description = desc_elem.text.strip() if desc_elem is not None and desc_elem.text else None
 
         # Parse deprecated info
-        deprecated_elem = elem.find('deprecated')
+        deprecated_elem = children.get('deprecated')
         deprecated = None
         replaced_by = None
         if deprecated_elem is not None:
@@ -238,34 +365,35 @@ class MAVLinkParser:
         """Parse a <message> element."""
         msg_id = int(elem.get('id', '0'), 0)  # base=0 auto-detects hex (0x), octal (0o), decimal
         name = elem.get('name', '')
+        children, field_elems = _index_children(elem, 'field')
 
         # Parse description
-        desc_elem = elem.find('description')
+        desc_elem = children.get('description')
         description = None
         if desc_elem is not None and desc_elem.text:
             # Clean up multiline descriptions
             description = ' '.join(desc_elem.text.strip().split())
 
         # Parse deprecated/superseded info
-        deprecated_elem = elem.find('deprecated')
+        deprecated_elem = children.get('deprecated')
         deprecated = deprecated_elem.get('since') if deprecated_elem is not None else None
         replaced_by = deprecated_elem.get('replaced_by') if deprecated_elem is not None else None
 
-        superseded_elem = elem.find('superseded')
+        superseded_elem = children.get('superseded')
         superseded = superseded_elem.get('since') if superseded_elem is not None else None
         if superseded and superseded_elem is not None:
             replaced_by = superseded_elem.get('replaced_by')
 
         # Check if work-in-progress
-        wip = elem.find('wip') is not None
+        wip = 'wip' in children
 
         # Parse fields
-        fields = []
-        for field_elem in elem.findall('field'):
-            field = self._parse_field(field_elem)
-            fields.append(field)
+        parse_field = self._parse_field
+        fields = [parse_field(field_elem) for field_elem in field_elems]
 
-        return Message(
+        # Values come straight from the XML and are already the right types,
+        # so pydantic validation is skipped
+        return Message.model_construct(
             id=msg_id,
             name=name,
             description=description,
@@ -274,6 +402,7 @@ class MAVLinkParser:
             superseded=superseded,
             replaced_by=replaced_by,
             wip=wip,
+            proto_name=sanitize_message_name(name),
         )
 
     def _parse_field(self, elem: etree._Element) -> MessageField:
@@ -296,6 +425,7 @@ class MAVLinkParser:
             description=description,
             invalid=invalid,
             print_format=print_format,
+            proto_name=sanitize_field_name(name),
         )
 
     def merge_dialects(self, base_dialect: str, *include_dialects: str) -> MAVLinkDialect:
@@ -307,8 +437,13 @@ class MAVLinkParser:
             *include_dialects: Additional dialects to merge
 
         Returns:
-            Merged MAVLinkDialect
+            Merged MAVLinkDialect (cached; shared between calls with the same arguments)
         """
+        # Earlier dialects take precedence, so the key keeps the given order
+        cache_key = (base_dialect,) + include_dialects
+        if cache_key in self._merged_cache:
+            return self._merged_cache[cache_key]
+
         # Parse all dialects
         dialects_to_merge = [base_dialect] + list(include_dialects)
         for dialect_name in dialects_to_merge:
@@ -340,9 +475,10 @@ class MAVLinkParser:
             # Merge messages
             for msg_id, message in dialect.messages.items():
                 if msg_id not in seen_messages:
-                    merged.messages[msg_id] = message
+                    merged.add_message(message)
                     seen_messages.add(msg_id)
 
+        self._merged_cache[cache_key] = merged
         return merged
 
     def resolve_includes(self, dialect_name: str) -> MAVLinkDialect:
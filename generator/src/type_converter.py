@@ -1,236 +1,257 @@
 """
 Type converter: MAVLink types to Protocol Buffer types.
 """
-from typing import Dict, Tuple
-
-
-class TypeConverter:
-    """Converts MAVLink types to Protocol Buffer types."""
-
-    # MAVLink type → (Proto type, is_fixed_width)
-    TYPE_MAP: Dict[str, Tuple[str, bool]] = {
-        # Unsigned integers
-        "uint8_t": ("uint32", False),
-        "uint16_t": ("uint32", False),
-        "uint32_t": ("uint32", False),
-        "uint64_t": ("uint64", False),
-
-        # Signed integers
-        "int8_t": ("int32", False),
-        "int16_t": ("int32", False),
-        "int32_t": ("int32", False),
-        "int64_t": ("int64", False),
-
-        # Floating point
-        "float": ("float", False),
-        "double": ("double", False),
-
-        # Character/string
-        "char": ("string", False),
-
-        # Special MAVLink types
-        "uint8_t_mavlink_version": ("uint32", False),
+import textwrap
+from functools import lru_cache
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, Optional
+
+
+# Proto scalar type names returned by to_proto_type
+PROTO_UINT32 = "uint32"
+PROTO_UINT64 = "uint64"
+PROTO_INT32 = "int32"
+PROTO_INT64 = "int64"
+PROTO_FLOAT = "float"
+PROTO_DOUBLE = "double"
+PROTO_STRING = "string"
+PROTO_BYTES = "bytes"
+
+# MAVLink type → Proto type
+TYPE_MAP: Dict[str, str] = {
+    # Unsigned integers
+    "uint8_t": PROTO_UINT32,
+    "uint16_t": PROTO_UINT32,
+    "uint32_t": PROTO_UINT32,
+    "uint64_t": PROTO_UINT64,
+
+    # Signed integers
+    "int8_t": PROTO_INT32,
+    "int16_t": PROTO_INT32,
+    "int32_t": PROTO_INT32,
+    "int64_t": PROTO_INT64,
+
+    # Floating point
+    "float": PROTO_FLOAT,
+    "double": PROTO_DOUBLE,
+
+    # Character/string
+    "char": PROTO_STRING,
+
+    # Special MAVLink types
+    "uint8_t_mavlink_version": PROTO_UINT32,
+}
+
+# Known MAVLink types, for membership checks that don't need the proto type
+_TYPE_KEYS: FrozenSet[str] = frozenset(TYPE_MAP)
+
+
+@lru_cache(maxsize=None)
+def to_proto_type(mavlink_type: str) -> str:
+    """
+    Convert MAVLink type to Protocol Buffer type.
+
+    Args:
+        mavlink_type: MAVLink field type (e.g., "uint8_t", "char[16]", "float")
+
+    Returns:
+        Proto type (e.g., "uint32", "string", "float")
+
+    Examples:
+        >>> to_proto_type("uint8_t")
+        'uint32'
+        >>> to_proto_type("char[16]")
+        'string'
+        >>> to_proto_type("uint8_t[8]")
+        'bytes'
+        >>> to_proto_type("uint32_t[6]")
+        'repeated uint32'
+    """
+    # Handle array types
+    bracket = mavlink_type.find("[")
+    if bracket >= 0 and "]" in mavlink_type:
+        base_type = mavlink_type[:bracket]
+
+        # char[] arrays are strings in proto
+        if base_type == "char":
+            return PROTO_STRING
+
+        # uint8_t[] arrays become bytes (compact binary representation)
+        if base_type == "uint8_t":
+            return PROTO_BYTES
+
+        # Other numeric arrays use repeated
+        return f"repeated {TYPE_MAP.get(base_type, PROTO_BYTES)}"
+
+    # Look up in type map
+    return TYPE_MAP.get(mavlink_type, PROTO_BYTES)
+
+
+@lru_cache(maxsize=None)
+def is_enum_type(field_type: str) -> bool:
+    """
+    Check if a field type is an enum reference (not in type map).
+
+    Args:
+        field_type: MAVLink field type
+
+    Returns:
+        True if this is likely an enum type
+    """
+    # If not in type map and not an array, probably an enum
+    return "[" not in field_type and field_type not in _TYPE_KEYS
+
+
+@lru_cache(maxsize=None)
+def get_field_type_info(field_type: str, enum_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get detailed type information for C++ code generation.
+
+    Results are cached per (field_type, enum_name); the returned dict is
+    shared between callers and must not be modified.
+
+    Args:
+        field_type: MAVLink field type
+        enum_name: Optional enum name if field references an enum
+
+    Returns:
+        Dict with: proto_type, cpp_type, is_enum, is_array, array_length
+    """
+    info: Dict[str, Any] = {
+        'proto_type': to_proto_type(field_type),
+        'is_enum': enum_name is not None,
+        'is_array': False,
+        'array_length': None,
+        'cpp_type': field_type
     }
 
-    @classmethod
-    def to_proto_type(cls, mavlink_type: str) -> str:
-        """
-        Convert MAVLink type to Protocol Buffer type.
-
-        Args:
-            mavlink_type: MAVLink field type (e.g., "uint8_t", "char[16]", "float")
-
-        Returns:
-            Proto type (e.g., "uint32", "string", "float")
-
-        Examples:
-            >>> TypeConverter.to_proto_type("uint8_t")
-            'uint32'
-            >>> TypeConverter.to_proto_type("char[16]")
-            'string'
-            >>> TypeConverter.to_proto_type("uint8_t[8]")
-            'bytes'
-            >>> TypeConverter.to_proto_type("uint32_t[6]")
-            'repeated uint32'
-        """
-        # Handle array types
-        if "[" in mavlink_type and "]" in mavlink_type:
-            base_type = mavlink_type[:mavlink_type.index("[")]
-
-            # char[] arrays are strings in proto
-            if base_type == "char":
-                return "string"
-
-            # uint8_t[] arrays become bytes (compact binary representation)
-            if base_type == "uint8_t":
-                return "bytes"
-
-            # Other numeric arrays use repeated
-            proto_type, _ = cls.TYPE_MAP.get(base_type, ("bytes", False))
-            return f"repeated {proto_type}"
-
-        # Look up in type map
-        proto_type, _ = cls.TYPE_MAP.get(mavlink_type, ("bytes", False))
-        return proto_type
-
-    @classmethod
-    def is_enum_type(cls, field_type: str) -> bool:
-        """
-        Check if a field type is an enum reference (not in type map).
-
-        Args:
-            field_type: MAVLink field type
-
-        Returns:
-            True if this is likely an enum type
-        """
-        # If not in type map and not an array, probably an enum
-        return "[" not in field_type and field_type not in cls.TYPE_MAP
-
-    @classmethod
-    def get_field_type_info(cls, field_type: str, enum_name: str = None) -> dict:
-        """
-        Get detailed type information for C++ code generation.
-
-        Args:
-            field_type: MAVLink field type
-            enum_name: Optional enum name if field references an enum
-
-        Returns:
-            Dict with: proto_type, cpp_type, is_enum, is_array, array_length
-        """
-        info = {
-            'proto_type': cls.to_proto_type(field_type),
-            'is_enum': enum_name is not None,
-            'is_array': False,
-            'array_length': None,
-            'cpp_type': field_type
-        }
-
-        if '[' in field_type and ']' in field_type:
-            info['is_array'] = True
-            start = field_type.index('[')
-            end = field_type.index(']')
-            info['array_length'] = int(field_type[start + 1:end])
-            info['cpp_type'] = field_type[:start]
-
-        if enum_name:
-            info['proto_type'] = cls.sanitize_enum_name(enum_name)
-
-        return info
-
-    @classmethod
-    def sanitize_enum_name(cls, name: str) -> str:
-        """
-        Convert MAVLink enum name to Proto enum name (PascalCase).
-
-        Args:
-            name: MAVLink enum name (e.g., "MAV_TYPE", "MAV_AUTOPILOT")
-
-        Returns:
-            Proto enum name (e.g., "MavType", "MavAutopilot")
-
-        Examples:
-            >>> TypeConverter.sanitize_enum_name("MAV_TYPE")
-            'MavType'
-            >>> TypeConverter.sanitize_enum_name("MAV_MODE_FLAG")
-            'MavModeFlag'
-        """
-        # Split by underscore and capitalize each part
-        parts = name.split("_")
-        return "".join(word.capitalize() for word in parts)
-
-    @classmethod
-    def sanitize_message_name(cls, name: str) -> str:
-        """
-        Convert MAVLink message name to Proto message name (PascalCase).
-
-        Args:
-            name: MAVLink message name (e.g., "HEARTBEAT", "GLOBAL_POSITION_INT")
-
-        Returns:
-            Proto message name (e.g., "Heartbeat", "GlobalPositionInt")
-
-        Examples:
-            >>> TypeConverter.sanitize_message_name("HEARTBEAT")
-            'Heartbeat'
-            >>> TypeConverter.sanitize_message_name("GLOBAL_POSITION_INT")
-            'GlobalPositionInt'
-        """
-        # Split by underscore and capitalize each part
-        parts = name.split("_")
-        return "".join(word.capitalize() for word in parts)
-
-    @classmethod
-    def sanitize_field_name(cls, name: str) -> str:
-        """
-        Convert MAVLink field name to Proto field name (snake_case, lowercase).
-
-        Args:
-            name: MAVLink field name
-
-        Returns:
-            Proto field name (lowercase snake_case)
-
-        Examples:
-            >>> TypeConverter.sanitize_field_name("base_mode")
-            'base_mode'
-            >>> TypeConverter.sanitize_field_name("Vcc")
-            'vcc'
-            >>> TypeConverter.sanitize_field_name("Vservo")
-            'vservo'
-        """
-        # Convert to lowercase for protobuf compatibility
-        # Protobuf field names should be lowercase_with_underscores
-        return name.lower()
-
-    @classmethod
-    def format_comment(cls, text: str, indent: int = 0) -> str:
-        """
-        Format a description as a proto comment.
-
-        Args:
-            text: Description text
-            indent: Indentation level (spaces)
-
-        Returns:
-            Formatted comment with // prefix
-
-        Examples:
-            >>> TypeConverter.format_comment("This is a test", 2)
-            '  // This is a test'
-        """
-        if not text:
-            return ""
-
-        # Clean up text (remove extra whitespace, newlines)
+    # Same bracket test as MessageField (both brackets must be present)
+    start = field_type.find('[')
+    end = field_type.find(']')
+    if start >= 0 and end >= 0:
+        info['is_array'] = True
+        info['array_length'] = int(field_type[start + 1:end])
+        info['cpp_type'] = field_type[:start]
+
+    if enum_name:
+        info['proto_type'] = sanitize_enum_name(enum_name)
+
+    return info
+
+
+@lru_cache(maxsize=None)
+def sanitize_enum_name(name: str) -> str:
+    """
+    Convert MAVLink enum name to Proto enum name (PascalCase).
+
+    Args:
+        name: MAVLink enum name (e.g., "MAV_TYPE", "MAV_AUTOPILOT")
+
+    Returns:
+        Proto enum name (e.g., "MavType", "MavAutopilot")
+
+    Examples:
+        >>> sanitize_enum_name("MAV_TYPE")
+        'MavType'
+        >>> sanitize_enum_name("MAV_MODE_FLAG")
+        'MavModeFlag'
+    """
+    # Split by underscore and capitalize each part
+    return "".join(map(str.capitalize, name.split("_")))
+
+
+# Message names follow the same PascalCase rule as enum names (and share
+# its cache), e.g. "GLOBAL_POSITION_INT" -> "GlobalPositionInt"
+sanitize_message_name = sanitize_enum_name
+
+
+@lru_cache(maxsize=None)
+def sanitize_field_name(name: str) -> str:
+    """
+    Convert MAVLink field name to Proto field name (snake_case, lowercase).
+
+    Args:
+        name: MAVLink field name
+
+    Returns:
+        Proto field name (lowercase snake_case)
+
+    Examples:
+        >>> sanitize_field_name("base_mode")
+        'base_mode'
+        >>> sanitize_field_name("Vcc")
+        'vcc'
+        >>> sanitize_field_name("Vservo")
+        'vservo'
+    """
+    # Convert to lowercase for protobuf compatibility
+    # Protobuf field names should be lowercase_with_underscores
+    return name.lower()
+
+
+@lru_cache(maxsize=None)
+def _comment_wrapper(width: int) -> textwrap.TextWrapper:
+    """Shared TextWrapper for comments of the given width (one per indent level)."""
+    return textwrap.TextWrapper(
+        width=width,
+        break_long_words=False,
+        break_on_hyphens=False,
+    )
+
+
+def format_comment(text: str, indent: int = 0) -> str:
+    """
+    Format a description as a proto comment.
+
+    Args:
+        text: Description text
+        indent: Indentation level (spaces)
+
+    Returns:
+        Formatted comment with // prefix
+
+    Examples:
+        >>> format_comment("This is a test", 2)
+        '  // This is a test'
+    """
+    if not text:
+        return ""
+
+    # Clean up text (remove extra whitespace, newlines). Most descriptions are
+    # already single-spaced lines: isprintable() rules out every whitespace
+    # char but " ", so only doubled or edge spaces are left to check
+    if (not text.isprintable() or "  " in text
+            or text[0] == " " or text[-1] == " "):
         text = " ".join(text.split())
 
-        prefix = " " * indent
+    prefix = " " * indent
 
-        # Split long comments into multiple lines (max 80 chars)
-        max_line_length = 80 - indent - 3  # "// " takes 3 chars
+    # Split long comments into multiple lines (max 80 chars)
+    max_line_length = 80 - indent - 3  # "// " takes 3 chars
 
-        if len(text) <= max_line_length:
-            return f"{prefix}// {text}"
+    if len(text) <= max_line_length:
+        return f"{prefix}// {text}"
 
-        # Split into multiple lines
-        words = text.split()
-        lines = []
-        current_line = []
-        current_length = 0
+    # Split into multiple lines; wrapped lines stay one char below the
+    # limit and long words are kept whole
+    lines = _comment_wrapper(max_line_length - 1).wrap(text)
 
-        for word in words:
-            word_length = len(word) + 1  # +1 for space
-            if current_length + word_length > max_line_length:
-                lines.append(" ".join(current_line))
-                current_line = [word]
-                current_length = word_length
-            else:
-                current_line.append(word)
-                current_length += word_length
+    return "\n".join(f"{prefix}// {line}" for line in lines)
 
-        if current_line:
-            lines.append(" ".join(current_line))
 
-        return "\n".join(f"{prefix}// {line}" for line in lines)
+class TypeConverter:
+    """
+    Converts MAVLink types to Protocol Buffer types.
+
+    Namespace kept for existing callers; the conversions are the module-level
+    functions above.
+    """
+
+    TYPE_MAP: ClassVar[Dict[str, str]] = TYPE_MAP
+
+    to_proto_type: ClassVar[Callable[[str], str]] = staticmethod(to_proto_type)
+    is_enum_type: ClassVar[Callable[[str], bool]] = staticmethod(is_enum_type)
+    get_field_type_info: ClassVar[Callable[..., Dict[str, Any]]] = staticmethod(get_field_type_info)
+    sanitize_enum_name: ClassVar[Callable[[str], str]] = staticmethod(sanitize_enum_name)
+    sanitize_message_name: ClassVar[Callable[[str], str]] = staticmethod(sanitize_message_name)
+    sanitize_field_name: ClassVar[Callable[[str], str]] = staticmethod(sanitize_field_name)
+    format_comment: ClassVar[Callable[..., str]] = staticmethod(format_comment)
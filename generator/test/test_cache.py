@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test for the parse cache: cached dialects are only reused for unchanged XML files.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import src as a package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parser import MAVLinkParser
+
+_XML = """<?xml version="1.0"?>
+<mavlink>
+  <version>3</version>
+  <dialect>0</dialect>
+  <messages>
+    <message id="0" name="{name}">
+      <description>Test message</description>
+      <field type="uint8_t" name="type">Type</field>
+    </message>
+  </messages>
+</mavlink>
+"""
+
+
+def _write_xml(path: Path, name: str, mtime_ns: int) -> None:
+    path.write_text(_XML.format(name=name))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _parse_cached(xml_dir: Path, cache: Path) -> MAVLinkParser:
+    parser = MAVLinkParser(xml_dir)
+    parser.load_cache(cache)
+    parser.parse_file("test.xml")
+    return parser
+
+
+def _message_name(parser: MAVLinkParser) -> str:
+    return parser.parsed_dialects["test"].messages[0].name
+
+
+def test_cache_follows_xml_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_dir = Path(tmp)
+        xml_file = xml_dir / "test.xml"
+        cache = xml_dir / ".cache" / "ast.pkl"
+
+        _write_xml(xml_file, "HEARTBEAT", 1_000_000_000)
+        _parse_cached(xml_dir, cache).save_cache(cache)
+
+        # Unchanged file: served from the cache, not parsed again
+        parser = MAVLinkParser(xml_dir)
+        parser.load_cache(cache)
+        parser._parse_xml = None  # any parse would fail
+        parser.parse_file("test.xml")
+        assert _message_name(parser) == "HEARTBEAT"
+
+        # Same size, new mtime
+        _write_xml(xml_file, "HEARTBEAX", 2_000_000_000)
+        parser = _parse_cached(xml_dir, cache)
+        assert _message_name(parser) == "HEARTBEAX"
+        parser.save_cache(cache)
+
+        # New size, mtime put back to the cached one
+        _write_xml(xml_file, "PING", 2_000_000_000)
+        parser = _parse_cached(xml_dir, cache)
+        assert _message_name(parser) == "PING"
+
+        # No temp files are left next to the cache
+        assert os.listdir(cache.parent) == ["ast.pkl"]
+
+
+def test_unreadable_cache_is_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        xml_dir = Path(tmp)
+        _write_xml(xml_dir / "test.xml", "HEARTBEAT", 1_000_000_000)
+
+        for content in (b"not a pickle", b"\x80\x05K\x01.", b""):
+            cache = xml_dir / "ast.pkl"
+            cache.write_bytes(content)
+            parser = _parse_cached(xml_dir, cache)
+            assert _message_name(parser) == "HEARTBEAT"
+
+
+def main():
+    test_cache_follows_xml_changes()
+    test_unreadable_cache_is_ignored()
+    print("✓ Parse cache tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,38 @@
 """
 Test for core MAVLink dialects: minimal, standard, and common.
 """
+import os
+import re
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.parser import MAVLinkParser
 from src.generator import ProtoGenerator
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-
-console = Console()
 
 # Core dialects to test
 CORE_DIALECTS = ["minimal", "standard", "common"]
 
+# protoc diagnostics start with the proto file they refer to
+_PROTOC_FILE_RE = re.compile(r"^(?P<file>[^:]+\.proto):")
+
+
+@lru_cache(maxsize=None)
+def _console():
+    """Shared rich console; rich is only imported once output is printed."""
+    from rich.console import Console
+    return Console()
+
 
 def parse_all_dialects(parser: MAVLinkParser, dialect_names: list) -> dict:
     """Parse all dialect XML files."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+
+    console = _console()
     dialects = {}
     failed = []
 
@@ -50,25 +61,20 @@ def parse_all_dialects(parser: MAVLinkParser, dialect_names: list) -> dict:
 
 def generate_all_protos(generator: ProtoGenerator, dialects: dict, output_dir: Path) -> dict:
     """Generate proto files for all dialects."""
+    console = _console()
     results = {"success": [], "failed": []}
 
     dialect_list = list(dialects.values())
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Generating protos...", total=None)
-
-        try:
-            generator.generate_all(dialect_list, output_dir)
-            results["success"] = list(dialects.keys())
-        except Exception as e:
-            console.print(f"[red]✗ Generation failed: {e}[/red]")
-            results["failed"] = list(dialects.keys())
-
-        progress.update(task, completed=True)
+    # No live progress display here: generate_all forks worker processes,
+    # and forking while rich's refresh thread runs is not safe
+    console.print("Generating protos...")
+    try:
+        generator.generate_all(dialect_list, output_dir, max_workers=None)
+        results["success"] = list(dialects.keys())
+    except Exception as e:
+        console.print(f"[red]✗ Generation failed: {e}[/red]")
+        results["failed"] = list(dialects.keys())
 
     return results
 
@@ -100,7 +106,10 @@ def validate_proto(proto_file: Path, proto_dir: Path) -> tuple:
 
 
 def validate_all_protos(proto_dir: Path, dialect_names: list) -> dict:
-    """Validate all generated proto files."""
+    """Validate all generated proto files, with a single protoc run where possible."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+
+    console = _console()
     results = {"valid": [], "warning": [], "error": []}
 
     with Progress(
@@ -112,6 +121,7 @@ def validate_all_protos(proto_dir: Path, dialect_names: list) -> dict:
     ) as progress:
         task = progress.add_task("Validating protos...", total=len(dialect_names))
 
+        proto_files = {}
         for name in dialect_names:
             proto_file = proto_dir / "mavlink" / f"{name}.proto"
 
@@ -120,15 +130,81 @@ def validate_all_protos(proto_dir: Path, dialect_names: list) -> dict:
                 progress.update(task, advance=1)
                 continue
 
-            status, message = validate_proto(proto_file, proto_dir)
-            results[status].append((name, message))
+            proto_files[name] = proto_file
+
+        if not proto_files:
+            return results
+
+        try:
+            result = subprocess.run(
+                ["protoc", f"--proto_path={proto_dir}", "--cpp_out=/tmp",
+                 *(str(f) for f in proto_files.values())],
+                capture_output=True,
+                text=True,
+                timeout=30 * len(proto_files),
+            )
+        except subprocess.TimeoutExpired:
+            failure = "Validation timeout"
+        except FileNotFoundError:
+            failure = "protoc not found"
+        except Exception as e:
+            failure = str(e)
+        else:
+            failure = None
+
+        if failure is not None:
+            for name in proto_files:
+                results["error"].append((name, failure))
+            progress.update(task, advance=len(proto_files))
+            return results
+
+        # Assign each diagnostic line to the dialect whose file it names
+        messages = {name: [] for name in proto_files}
+        for line in result.stderr.splitlines():
+            match = _PROTOC_FILE_RE.match(line)
+            if match:
+                name = Path(match.group("file")).stem
+                if name in messages:
+                    messages[name].append(line)
+
+        # protoc stops at the first file with errors, so after a failure a
+        # file it reported nothing for may not have been checked at all
+        unchecked = []
+        for name, lines in messages.items():
+            if result.returncode != 0 and not lines:
+                unchecked.append(name)
+                continue
+            message = "\n".join(lines)
+            if any(": warning:" not in line for line in lines):
+                results["error"].append((name, message))
+            elif lines:
+                results["warning"].append((name, message))
+            else:
+                results["valid"].append((name, None))
             progress.update(task, advance=1)
 
+        if unchecked:
+            # One protoc per file, run concurrently (each thread just waits
+            # on its subprocess)
+            with ThreadPoolExecutor(max_workers=min(len(unchecked), os.cpu_count() or 1)) as executor:
+                checked = executor.map(
+                    lambda name: (name, validate_proto(proto_files[name], proto_dir)),
+                    unchecked,
+                )
+                for name, (status, message) in checked:
+                    results[status].append((name, message))
+                    progress.update(task, advance=1)
+
     return results
 
 
 def main():
     """Main test function."""
+    from rich.table import Table
+    from rich.panel import Panel
+
+    console = _console()
+
     console.print(Panel.fit("Core MAVLink Dialects Test (minimal, standard, common)", style="bold blue"))
 
     # Paths
@@ -164,6 +240,17 @@ def main():
     else:
         console.print(f"✓ Generated protos for {len(gen_results['success'])} dialects")
 
+    # Proto file sizes for the summary table, read once
+    proto_sizes = dict.fromkeys(dialects, 0)
+    try:
+        with os.scandir(output_dir / "mavlink") as it:
+            for entry in it:
+                name, ext = os.path.splitext(entry.name)
+                if ext == ".proto" and name in proto_sizes:
+                    proto_sizes[name] = entry.stat().st_size
+    except FileNotFoundError:
+        pass
+
     # Step 4: Validate with protoc
     console.print("\n[cyan]Step 4: Validating with protoc...[/cyan]")
     val_results = validate_all_protos(output_dir, list(dialects.keys()))
@@ -181,8 +268,7 @@ def main():
     for name, _ in val_results["valid"]:
         if name in dialects:
             dialect = dialects[name]
-            proto_file = output_dir / "mavlink" / f"{name}.proto"
-            size = proto_file.stat().st_size if proto_file.exists() else 0
+            size = proto_sizes[name]
             table.add_row(
                 name,
                 str(len(dialect.enums)),
@@ -195,8 +281,7 @@ def main():
     for name, msg in val_results["warning"]:
         if name in dialects:
             dialect = dialects[name]
-            proto_file = output_dir / "mavlink" / f"{name}.proto"
-            size = proto_file.stat().st_size if proto_file.exists() else 0
+            size = proto_sizes[name]
             warning_line = msg.split('\n')[0] if msg else "Unknown warning"
             table.add_row(
                 name,
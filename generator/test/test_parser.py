@@ -9,15 +9,17 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.parser import MAVLinkParser
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-
-console = Console()
 
 
 def main():
     """Test the parser with real MAVLink XML files."""
+    # rich is only needed for output, so it is imported when the test runs
+    from rich.console import Console
+    from rich.table import Table
+    from rich.panel import Panel
+
+    console = Console()
+
     # Path to MAVLink definitions (go up to project root, then to mavlink)
     xml_dir = Path(__file__).parent.parent.parent / "mavlink" / "message_definitions" / "v1.0"
 